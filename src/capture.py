@@ -0,0 +1,194 @@
+"""
+Capture pathological games during batch runs.
+
+A `Reservoir` checks every finished game against a set of triggers (cheap checks on the final
+state, e.g. `unfinished` for games that hit the max turn count) and saves the seed and final
+state of the games that match to a directory, one JSON file per game. Each trigger keeps at most
+`size` games, chosen uniformly at random from all of its matches (reservoir sampling), so the
+directory stays bounded however long the campaign. Games that raise are captured too.
+
+Captured games can be replayed exactly with
+`game.simulate(player_count, max_turns, seed=seed, index=index, edition=edition)`.
+"""
+
+from dataclasses import asdict
+import json
+import os
+from random import Random
+import traceback
+from typing import Callable, Optional
+
+from game import Game
+
+# Checks a finished game, given the game and the number of turns it took
+Trigger = Callable[[Game, int], bool]
+
+
+def unfinished(game: Game, nturns: int) -> bool:
+    return not game.finished
+
+
+def shorter_than(turns: int) -> Trigger:
+    def _inner(game: Game, nturns: int) -> bool:
+        return nturns < turns
+
+    return _inner
+
+
+def money_above(amount: int) -> Trigger:
+    def _inner(game: Game, nturns: int) -> bool:
+        return any(p.money > amount for p in game.players)
+
+    return _inner
+
+
+class Reservoir:
+    EXCEPTION = "exception"
+
+    def __init__(
+        self,
+        directory: str,
+        triggers: dict[str, Trigger],
+        size: int = 100,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Games are saved under `directory`, at most `size` per trigger. Match counts are kept in
+        the directory too (written whenever a game is saved, and by `flush` and `close`), so a
+        reservoir can be reopened to carry on sampling across runs.
+        """
+        assert Reservoir.EXCEPTION not in triggers, f"{Reservoir.EXCEPTION} is reserved"
+        self._directory = directory
+        self._triggers = triggers
+        self._size = size
+        self._rng = Random(seed)
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self._counts_path()) as f:
+                self._seen: dict[str, int] = json.load(f)
+        except FileNotFoundError:
+            self._seen = {}
+
+    @property
+    def seen(self) -> dict[str, int]:
+        """
+        Number of games that matched each trigger, whether they were kept or not.
+        """
+        return self._seen
+
+    def check(
+        self,
+        game: Game,
+        nturns: int,
+        seed: int,
+        index: int,
+        edition: Optional[str] = None,
+    ) -> None:
+        for reason, trigger in self._triggers.items():
+            if trigger(game, nturns):
+                self.capture(reason, game, seed, index, nturns, edition=edition)
+
+    def capture(
+        self,
+        reason: str,
+        game: Game,
+        seed: int,
+        index: int,
+        nturns: Optional[int] = None,
+        error: Optional[BaseException] = None,
+        edition: Optional[str] = None,
+    ) -> None:
+        """
+        Count a match of `reason`, and save the game if it's sampled. `edition` is the name of
+        (or path to) the edition the game was played on, None for the standard board.
+        """
+        seen = self._seen[reason] = self._seen.get(reason, 0) + 1
+        slot = seen - 1 if seen <= self._size else self._rng.randrange(seen)
+        if slot < self._size:
+            snapshot = {
+                "reason": reason,
+                "seed": seed,
+                "index": index,
+                "player_count": game.player_count,
+                "max_turns": game.max_turns,
+                "edition": edition,
+                "turns": nturns,
+                "money": (
+                    game.history.money[-1].tolist() if len(game.history) else None
+                ),
+                "players": [asdict(p) for p in game.players],
+                "board": [
+                    {
+                        "space": i,
+                        "name": space.meta.name,
+                        "owned_by": space.owned_by,
+                        "houses": space.houses,
+                        "hotel": space.hotel,
+                    }
+                    for i, space in enumerate(game.board)
+                    if space.owned_by is not None
+                ],
+                "error": (
+                    "".join(traceback.format_exception(error)) if error else None
+                ),
+            }
+            path = os.path.join(self._directory, f"{reason}-{slot}.json")
+            with open(path, "w") as f:
+                json.dump(snapshot, f, indent=2)
+            # Keep the counts in step with the saved games
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write the match counts to the directory.
+        """
+        with open(self._counts_path(), "w") as f:
+            json.dump(self._seen, f)
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "Reservoir":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _counts_path(self) -> str:
+        return os.path.join(self._directory, "counts.json")
+
+
+def run(
+    game: Game,
+    seed: int,
+    index: int,
+    reservoir: Optional[Reservoir],
+    edition: Optional[str] = None,
+) -> Optional[int]:
+    """
+    Run a game, checking it against the reservoir's triggers (if any). Returns the number of
+    turns, or None if the game raised and was captured.
+    """
+    if reservoir is None:
+        return game.run()
+    try:
+        nturns = game.run()
+    except Exception as e:
+        reservoir.capture(
+            Reservoir.EXCEPTION, game, seed, index, error=e, edition=edition
+        )
+        return None
+    reservoir.check(game, nturns, seed, index, edition)
+    return nturns
+
+
+def load(directory: str) -> list[dict]:
+    """
+    Load every game captured in a directory.
+    """
+    snapshots = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json") and name != "counts.json":
+            with open(os.path.join(directory, name)) as f:
+                snapshots.append(json.load(f))
+    return snapshots
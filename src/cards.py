@@ -1,6 +1,6 @@
 from dataclasses import dataclass
-from random import shuffle
-from typing import Callable
+from random import Random
+from typing import Callable, Optional
 
 
 @dataclass
@@ -10,15 +10,16 @@ class Card:
 
 
 class Deck:
-    def __init__(self, cards: list[Card]) -> None:
+    def __init__(self, cards: list[Card], rng: Optional[Random] = None) -> None:
+        self._rng = rng or Random()
         self._cards = cards
         self._discard: list[Card] = []
-        shuffle(self._cards)
+        self._rng.shuffle(self._cards)
 
     def draw(self) -> Card:
         card = self._cards.pop()
         self._discard.append(card)
         if not self._cards:
             self._cards, self._discard = self._discard, self._cards
-            shuffle(self._cards)
+            self._rng.shuffle(self._cards)
         return card
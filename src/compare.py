@@ -0,0 +1,132 @@
+"""
+Compare rule variants or strategies using common random numbers.
+
+Every arm of a comparison replays the same seeded games: game `i` of each arm gets the same seed
+(`seeding.game_seed(seed, i)`), so the same dice rolls and card shuffles, and only the variant
+itself differs. Differences between arms are then measured game by game, which cancels most of
+the luck that would otherwise swamp them. Optionally, each seed is also played with antithetic
+dice (every die showing 7 minus its value), and the two games are averaged into a single sample.
+
+    from compare import arm, compare
+
+    class Frugal(Game):
+        def _buy_houses_and_hotels(self, player):
+            if player.money > 500:
+                super()._buy_houses_and_hotels(player)
+
+    result = compare({"greedy": arm(), "frugal": Frugal}, games=10_000)
+    print(result.difference("frugal"))
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import numpy as np
+
+from game import Game
+from seeding import game_seed
+
+# Makes a game for an arm, given the seed and whether to use antithetic dice
+Arm = Callable[..., Game]
+# Measures a game, given the game and the number of turns it took
+Metric = Callable[[Game, int], float]
+
+_Z_95 = 1.959964
+
+
+def arm(**kwargs) -> Arm:
+    """
+    An arm playing `Game(**kwargs)`.
+    """
+
+    def _inner(seed: int, antithetic: bool = False) -> Game:
+        return Game(**kwargs, seed=seed, antithetic=antithetic)
+
+    return _inner
+
+
+def game_length(game: Game, nturns: int) -> float:
+    return nturns
+
+
+@dataclass
+class Difference:
+    """
+    Paired difference in the mean of a metric between an arm and the baseline arm, with a 95%
+    confidence interval.
+    """
+
+    arm: str
+    baseline: str
+    mean: float
+    std_err: float
+    ci_low: float
+    ci_high: float
+    # Games needed per arm to reach the same confidence interval with independent dice, divided
+    # by the games needed per arm here
+    variance_reduction: float
+
+
+@dataclass
+class Comparison:
+    # Metric of every game, indexed [seed, antithetic], per arm
+    values: dict[str, np.ndarray]
+    antithetic: bool
+
+    @property
+    def baseline(self) -> str:
+        return next(iter(self.values))
+
+    def mean(self, arm: str) -> float:
+        return float(self.values[arm].mean())
+
+    def difference(self, arm: str, baseline: Optional[str] = None) -> Difference:
+        baseline = baseline or self.baseline
+        a, b = self.values[arm], self.values[baseline]
+        # Antithetic pairs are averaged into a single sample before differencing
+        diffs = a.mean(axis=1) - b.mean(axis=1)
+        mean = float(diffs.mean())
+        std_err = float(diffs.std(ddof=1) / np.sqrt(len(diffs)))
+        games_per_sample = a.shape[1]
+        independent_variance = a.var(ddof=1) + b.var(ddof=1)
+        paired_variance = diffs.var(ddof=1) * games_per_sample
+        return Difference(
+            arm,
+            baseline,
+            mean,
+            std_err,
+            mean - _Z_95 * std_err,
+            mean + _Z_95 * std_err,
+            (
+                float(independent_variance / paired_variance)
+                if paired_variance
+                else float("inf")
+            ),
+        )
+
+    def differences(self) -> list[Difference]:
+        """
+        Paired differences between every other arm and the baseline (the first arm).
+        """
+        return [self.difference(arm) for arm in self.values if arm != self.baseline]
+
+
+def compare(
+    arms: dict[str, Arm],
+    games: int = 10_000,
+    seed: int = 0,
+    antithetic: bool = False,
+    metric: Metric = game_length,
+) -> Comparison:
+    """
+    Play `games` seeds (twice each, with `antithetic`) on every arm and measure each game. The
+    first arm is the baseline for differences.
+    """
+    variants = (False, True) if antithetic else (False,)
+    values = {name: np.zeros((games, len(variants))) for name in arms}
+    for i in range(games):
+        for name, make_game in arms.items():
+            for j, flipped in enumerate(variants):
+                game = make_game(seed=game_seed(seed, i), antithetic=flipped)
+                values[name][i, j] = metric(game, game.run())
+    return Comparison(values, antithetic)
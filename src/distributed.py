@@ -0,0 +1,302 @@
+"""
+Run a campaign of games across several machines.
+
+A coordinator splits the campaign into seeded chunks and hands them out, one at a time, to
+workers that connect to it over TCP (using `multiprocessing.connection`, so no broker is needed).
+If a worker dies or times out while holding a chunk, the chunk goes back on the queue for
+another worker. The `Summary` of each chunk is merged as it comes back.
+
+Chunks and results are exchanged as pickles, so anyone who can authenticate with the coordinator
+(or impersonate it to a worker) can run code on the other end. Both sides must share a secret
+key, given with `--authkey` or in the MONOPOLY_SIMULATOR_AUTHKEY environment variable:
+
+    export MONOPOLY_SIMULATOR_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+    python distributed.py coordinate --address 0.0.0.0:6000 --games 1000000
+    python distributed.py work --address coordinator-host:6000
+"""
+
+from argparse import ArgumentParser
+from collections import deque
+from dataclasses import dataclass
+import ipaddress
+import logging
+from multiprocessing import Process
+from multiprocessing.connection import Client, Connection, Listener
+import os
+import secrets
+import socket
+import threading
+from typing import Optional
+
+import capture
+from edition import load as load_edition
+from game import Game
+from seeding import game_seed
+from stats import Summary
+
+AUTHKEY_ENV = "MONOPOLY_SIMULATOR_AUTHKEY"
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """
+    A contiguous run of games from a campaign. Game `i` of the campaign is played with seed
+    `game_seed(seed, i)`, so a chunk plays out the same no matter which worker runs it.
+    """
+
+    seed: int
+    start: int
+    count: int
+    player_count: int
+    # Batches must be capped: some games never end without a turn limit
+    max_turns: int
+    # Name of (or path to) the edition to play, the standard board if unset
+    edition: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.max_turns, int) or self.max_turns < 1:
+            raise ValueError(
+                f"max_turns must be a positive int, not {self.max_turns!r}"
+            )
+
+
+def run_chunk(chunk: Chunk, reservoir: Optional[capture.Reservoir] = None) -> Summary:
+    """
+    Play a chunk of games, saving the ones that match the reservoir's triggers (if any). Games
+    that raise are left out of the summary when there is a reservoir to capture them.
+    """
+    summary = Summary()
+    board = load_edition(chunk.edition) if chunk.edition else None
+    for i in range(chunk.start, chunk.start + chunk.count):
+        game = Game(
+            chunk.player_count,
+            chunk.max_turns,
+            seed=game_seed(chunk.seed, i),
+            edition=board,
+        )
+        nturns = capture.run(game, chunk.seed, i, reservoir, chunk.edition)
+        if nturns is not None:
+            summary.add(nturns, game.finished)
+    return summary
+
+
+class Coordinator:
+    def __init__(
+        self,
+        games: int,
+        chunk_size: int = 1_000,
+        seed: int = 0,
+        player_count: int = 4,
+        max_turns: int = 100,
+        address: tuple[str, int] = ("localhost", 0),
+        authkey: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+        edition: Optional[str] = None,
+    ) -> None:
+        """
+        Workers must connect with the same `authkey`. A random one (see `authkey`) is made up
+        when listening on a loopback address without one; other addresses require it.
+
+        Set `timeout` to give up on (and reassign the chunk of) a worker that takes longer than
+        that many seconds on a single chunk. Workers load `edition` by name or path themselves,
+        so it must be available on every worker machine.
+        """
+        if authkey is None:
+            if not _is_loopback(address[0]):
+                raise ValueError(f"an authkey is required to listen on {address[0]}")
+            authkey = secrets.token_bytes(32)
+        self._authkey = authkey
+        self._pending = deque(
+            Chunk(
+                seed,
+                start,
+                min(chunk_size, games - start),
+                player_count,
+                max_turns,
+                edition,
+            )
+            for start in range(0, games, chunk_size)
+        )
+        self._remaining = len(self._pending)
+        self._done: set[int] = set()
+        self._summary = Summary()
+        self._timeout = timeout
+        self._cond = threading.Condition()
+        self._listener = Listener(address, authkey=authkey)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._listener.address
+
+    @property
+    def authkey(self) -> bytes:
+        return self._authkey
+
+    def run(self) -> Summary:
+        """
+        Serve chunks to workers until every chunk has been completed.
+        """
+        threading.Thread(target=self._accept, daemon=True).start()
+        with self._cond:
+            self._cond.wait_for(lambda: self._remaining == 0)
+        self._listener.close()
+        return self._summary
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                return  # listener closed
+            except Exception as e:
+                logging.warning(f"Rejected worker connection: {e!r}")
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _next_chunk(self) -> Optional[Chunk]:
+        """
+        Wait for a chunk to hand out. Returns None once the campaign is complete.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or self._remaining == 0)
+            return self._pending.popleft() if self._pending else None
+
+    def _serve(self, conn: Connection) -> None:
+        with conn:
+            while chunk := self._next_chunk():
+                try:
+                    conn.send(chunk)
+                    if self._timeout is not None and not conn.poll(self._timeout):
+                        raise TimeoutError(f"no result after {self._timeout}s")
+                    result = conn.recv()
+                    if not isinstance(result, Summary):
+                        raise TypeError(f"expected a Summary, got {result!r:.100}")
+                    # Merge into a fresh summary first, so a bad result can't spoil the total
+                    summary = Summary().merge(result)
+                except Exception as e:
+                    logging.warning(
+                        f"Lost worker on games {chunk.start}..{chunk.start + chunk.count} ({e!r}), reassigning"
+                    )
+                    with self._cond:
+                        self._pending.append(chunk)
+                        self._cond.notify_all()
+                    return
+                with self._cond:
+                    if chunk.start not in self._done:
+                        self._done.add(chunk.start)
+                        self._summary.merge(summary)
+                        self._remaining -= 1
+                    self._cond.notify_all()
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+
+
+def work(address: tuple[str, int], authkey: bytes) -> None:
+    """
+    Run chunks from the coordinator at `address` until it says the campaign is complete.
+    """
+    with Client(address, authkey=authkey) as conn:
+        while True:
+            try:
+                chunk = conn.recv()
+            except (EOFError, OSError):
+                return
+            if chunk is None:
+                return
+            logging.debug(f"Running games {chunk.start}..{chunk.start + chunk.count}")
+            summary = run_chunk(chunk)
+            try:
+                conn.send(summary)
+            except OSError as e:
+                # Most likely the coordinator timed out on this worker and reassigned its chunk
+                logging.warning(f"Lost the coordinator ({e!r})")
+                return
+
+
+def simulate_distributed(
+    games: int,
+    workers: int = 4,
+    chunk_size: int = 1_000,
+    seed: int = 0,
+    player_count: int = 4,
+    max_turns: int = 100,
+    edition: Optional[str] = None,
+) -> Summary:
+    """
+    Run a campaign with a coordinator and `workers` worker processes, all on this machine.
+    """
+    coordinator = Coordinator(
+        games, chunk_size, seed, player_count, max_turns, edition=edition
+    )
+    processes = [
+        Process(
+            target=work, args=(coordinator.address, coordinator.authkey), daemon=True
+        )
+        for _ in range(workers)
+    ]
+    for p in processes:
+        p.start()
+    summary = coordinator.run()
+    for p in processes:
+        p.join()
+    return summary
+
+
+def _address(s: str) -> tuple[str, int]:
+    host, port = s.rsplit(":", 1)
+    return host, int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except OSError:
+        return False
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="monopoly-simulator-distributed",
+        description="Run a Monopoly campaign across several worker machines",
+    )
+    parser.add_argument("role", choices=("coordinate", "work"))
+    parser.add_argument("-a", "--address", type=_address, default="localhost:6000")
+    parser.add_argument("-g", "--games", type=int, default=10_000)
+    parser.add_argument("-c", "--chunk-size", type=int, default=1_000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    parser.add_argument("-p", "--players", type=int, default=4)
+    parser.add_argument("-t", "--max-turns", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("-e", "--edition", default=None)
+    parser.add_argument(
+        "-k",
+        "--authkey",
+        default=os.environ.get(AUTHKEY_ENV),
+        help=f"secret shared by the coordinator and workers (default: ${AUTHKEY_ENV})",
+    )
+    parser.add_argument(
+        "-l", "--loglevel", default="INFO", choices=("INFO", "WARN", "ERROR")
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=args.loglevel)
+    if not args.authkey:
+        parser.error(f"pass a secret with --authkey or set ${AUTHKEY_ENV}")
+    authkey = args.authkey.encode()
+    if args.role == "work":
+        work(args.address, authkey)
+    else:
+        summary = Coordinator(
+            args.games,
+            args.chunk_size,
+            args.seed,
+            args.players,
+            args.max_turns,
+            args.address,
+            authkey,
+            timeout=args.timeout,
+            edition=args.edition,
+        ).run()
+        logging.info(f"{summary.games} games, {summary.unfinished} unfinished")
+        logging.info(f"Average game length: {summary.mean()}")
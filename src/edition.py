@@ -0,0 +1,372 @@
+"""
+Board editions: the spaces and card decks a game is played with.
+
+Editions are written as JSON (see `editions/standard.json`) and compiled once into a binary
+cache of fixed-size tables (prices, rents, groups, special spaces and card opcodes) next to the
+source. Loading an edition memory-maps its cache, so every process on a machine shares the same
+pages and none of them parse the source again; the cache is rebuilt whenever the source changes.
+If the source's directory can't be written, the cache goes in the user's cache directory
+(`$XDG_CACHE_HOME`, or `~/.cache`) instead, and failing that the tables are kept in memory.
+
+The cache of the standard edition is shipped with the source. Rebuild it after editing
+`editions/standard.json` with:
+
+    python edition.py standard
+
+    from edition import load
+    from game import Game
+
+    game = Game(edition=load("path/to/my-edition.json"))
+"""
+
+from argparse import ArgumentParser
+from enum import IntEnum
+from functools import lru_cache
+import hashlib
+import io
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Optional, Union
+
+import numpy as np
+
+EDITIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "editions")
+
+# Bump whenever the layout of the compiled tables changes
+VERSION = 2
+_MAGIC = b"MONOPOLY"
+_HEADER = struct.Struct("<8sII")
+_TABLE = struct.Struct("<16s8sI4QQ")
+_ALIGN = 64
+
+# Held while loading, so threads that load the same edition at once compile it only once
+_lock = threading.Lock()
+
+
+class Kind(IntEnum):
+    GO = 0
+    STREET = 1
+    RAILROAD = 2
+    UTILITY = 3
+    CHANCE = 4
+    COMMUNITY_CHEST = 5
+    TAX = 6
+    JAIL = 7
+    GO_TO_JAIL = 8
+    FREE_PARKING = 9
+
+
+class Op(IntEnum):
+    """
+    Card effects. Each card is compiled to an opcode and up to two integer arguments.
+    """
+
+    ADVANCE_TO = 0  # space, whether to collect $200 for passing Go
+    ADVANCE_TO_RAILROAD = 1
+    ADVANCE_TO_UTILITY = 2
+    COLLECT = 3  # amount
+    PAY = 4  # amount
+    GET_OUT_OF_JAIL_FREE = 5
+    GO_BACK = 6  # number of spaces
+    GO_TO_JAIL = 7
+    REPAIRS = 8  # price per house, price per hotel
+    PAY_EACH_PLAYER = 9  # amount
+    COLLECT_FROM_EACH_PLAYER = 10  # amount
+
+
+class DeckKind(IntEnum):
+    CHANCE = 0
+    COMMUNITY_CHEST = 1
+
+
+class EditionError(ValueError):
+    pass
+
+
+class Edition:
+    """
+    A compiled edition, memory-mapped from its cache at `path` (or read from `data`, a compiled
+    cache in memory, if given). Tables are read-only NumPy arrays indexed by space; what the
+    engine looks up on every move is also kept as plain tuples and ints.
+    """
+
+    def __init__(self, path: Optional[str], data: Optional[bytes] = None) -> None:
+        self.path = path
+        if data is None:
+            assert path is not None
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = data
+        tables = _read_tables(self._buffer)
+        self.name = str(tables["name"][0])
+        self.names: np.ndarray = tables["names"]
+        self.groups: np.ndarray = tables["groups"]
+        self.group_names: np.ndarray = tables["group_names"]
+        # Buying price and building price, indexed by space
+        self.prices: np.ndarray = tables["prices"]
+        # Indexed by space. Streets: rent with 0-4 houses and with a hotel. Railroads: rent by
+        # the number of railroads owned (from 1). Utilities: what the dice roll is multiplied by
+        # for rent, by the number of utilities owned (from 1).
+        self.rents: np.ndarray = tables["rents"]
+        self.taxes: tuple[int, ...] = tuple(int(t) for t in tables["taxes"])
+        self.kinds: tuple[Kind, ...] = tuple(Kind(k) for k in tables["kinds"])
+        self.go, self.jail, self.go_to_jail, self.free_parking = (
+            int(i) for i in tables["specials"]
+        )
+        self.railroads = self._spaces_of_kind(Kind.RAILROAD)
+        self.utilities = self._spaces_of_kind(Kind.UTILITY)
+        self.chances = self._spaces_of_kind(Kind.CHANCE)
+        self.community_chests = self._spaces_of_kind(Kind.COMMUNITY_CHEST)
+        self._decks = {
+            deck: tuple(
+                (str(text), Op(op), int(arg0), int(arg1))
+                for text, (kind, op, arg0, arg1) in zip(
+                    tables["card_texts"], tables["cards"]
+                )
+                if kind == deck
+            )
+            for deck in DeckKind
+        }
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def find(self, name: str) -> int:
+        return int(np.flatnonzero(self.names == name)[0])
+
+    def cards(self, deck: DeckKind) -> tuple[tuple[str, Op, int, int], ...]:
+        """
+        Text, opcode and arguments of each card in a deck, in the order they were defined.
+        """
+        return self._decks[deck]
+
+    def _spaces_of_kind(self, kind: Kind) -> tuple[int, ...]:
+        return tuple(i for i, k in enumerate(self.kinds) if k == kind)
+
+
+@lru_cache(maxsize=None)
+def _load(source: str, cache_dirs: tuple[str, ...]) -> Edition:
+    paths = [os.path.join(d, _cache_name(source)) for d in cache_dirs]
+    for path in paths:
+        if os.path.exists(path):
+            return Edition(path)
+    for path in paths:
+        try:
+            compile_edition(source, path)
+        except OSError as e:
+            logging.debug(f"Can't write edition cache {path} ({e!r})")
+            continue
+        return Edition(path)
+    logging.warning(f"No writable cache for edition {source}, keeping it in memory")
+    return Edition(None, _compile_source(source))
+
+
+def load(name: str = "standard", cache_dir: Optional[str] = None) -> Edition:
+    """
+    Load an edition by name (from `editions/`) or by path to its JSON source, compiling it
+    first if its cache is missing or out of date. Editions are only loaded once per process.
+    """
+    source = os.path.abspath(_source(name))
+    if cache_dir:
+        cache_dirs = (os.path.abspath(cache_dir),)
+    else:
+        cache_dirs = (os.path.join(os.path.dirname(source), "__cache__"), _user_cache())
+    with _lock:
+        return _load(source, cache_dirs)
+
+
+def compile_edition(source: str, path: str) -> None:
+    """
+    Compile the JSON edition at `source` into a binary table cache at `path`.
+    """
+    data = _compile_source(source)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write to a temporary file first, so other processes never see a partial cache
+    fd, tmp = tempfile.mkstemp(".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp makes the file private, but the cache is as public as its source
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _source(name: str) -> str:
+    return (
+        name if name.endswith(".json") else os.path.join(EDITIONS_DIR, f"{name}.json")
+    )
+
+
+def _cache_name(source: str) -> str:
+    with open(source, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return f"{stem}-v{VERSION}-{digest}.bin"
+
+
+def _user_cache() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "monopoly-simulator", "editions")
+
+
+def _compile_source(source: str) -> bytes:
+    with open(source, encoding="utf-8") as f:
+        definition = json.load(f)
+    buf = io.BytesIO()
+    _write_tables(buf, _compile(definition))
+    return buf.getvalue()
+
+
+def _compile(definition: dict) -> dict[str, np.ndarray]:
+    spaces = definition["spaces"]
+    names = [s["name"] for s in spaces]
+    try:
+        kinds = [Kind[s["kind"].upper()] for s in spaces]
+    except KeyError as e:
+        raise EditionError(f"unknown kind of space {e}") from e
+    if kinds[0] != Kind.GO:
+        raise EditionError("the first space must be Go")
+    specials = []
+    for kind in (Kind.GO, Kind.JAIL, Kind.GO_TO_JAIL, Kind.FREE_PARKING):
+        if kinds.count(kind) != 1:
+            raise EditionError(f"expected exactly one {kind.name} space")
+        specials.append(kinds.index(kind))
+    group_names = list(dict.fromkeys(s["color"] for s in spaces if s.get("color")))
+    rents = []
+    for s, kind in zip(spaces, kinds):
+        match kind:
+            case Kind.STREET:
+                if not s.get("color"):
+                    raise EditionError(f"{s['name']}: streets need a color")
+                expected, what = 6, "6 rents (0-4 houses, hotel)"
+            case Kind.RAILROAD | Kind.UTILITY:
+                # One rent (or dice multiplier) for each count of its kind a player can own
+                expected = kinds.count(kind)
+                if expected > 6:
+                    raise EditionError(
+                        f"at most 6 {kind.name.lower()} spaces are supported"
+                    )
+                what = f"{expected} rents (one for each {kind.name.lower()} owned)"
+            case _:
+                expected, what = 0, "no rent"
+        rent = s.get("rent", [])
+        if len(rent) != expected:
+            raise EditionError(f"{s['name']}: expected {what}")
+        rents.append(rent + [0] * (6 - len(rent)))
+
+    def space_index(name: str) -> int:
+        if name not in names:
+            raise EditionError(f"card refers to unknown space {name!r}")
+        return names.index(name)
+
+    cards, card_texts = [], []
+    for deck in DeckKind:
+        for card in definition[deck.name.lower()]:
+            try:
+                op = Op[card["effect"].upper()]
+            except KeyError as e:
+                raise EditionError(f"unknown card effect {e}") from e
+            match op:
+                case Op.ADVANCE_TO:
+                    args = (space_index(card["space"]), card.get("collect_go", True))
+                case (
+                    Op.COLLECT
+                    | Op.PAY
+                    | Op.PAY_EACH_PLAYER
+                    | Op.COLLECT_FROM_EACH_PLAYER
+                ):
+                    args = (card["amount"], 0)
+                case Op.GO_BACK:
+                    args = (card["spaces"], 0)
+                case Op.REPAIRS:
+                    args = (card["house"], card["hotel"])
+                case Op.ADVANCE_TO_RAILROAD if Kind.RAILROAD not in kinds:
+                    raise EditionError(f"{card['text']!r}: there are no railroads")
+                case Op.ADVANCE_TO_UTILITY if Kind.UTILITY not in kinds:
+                    raise EditionError(f"{card['text']!r}: there are no utilities")
+                case _:
+                    args = (0, 0)
+            cards.append((deck, op, *args))
+            card_texts.append(card["text"])
+
+    return {
+        "name": np.array([definition.get("name", "")]),
+        "names": np.array(names),
+        "kinds": np.array(kinds, np.uint8),
+        "groups": np.array(
+            [group_names.index(s["color"]) if s.get("color") else -1 for s in spaces],
+            np.int16,
+        ),
+        "group_names": np.array(group_names, dtype=np.str_),
+        "prices": np.array(
+            [(s.get("price", 0), s.get("building_price", 0)) for s in spaces], np.int32
+        ),
+        "rents": np.array(rents, np.int32),
+        "taxes": np.array([s.get("tax", 0) for s in spaces], np.int32),
+        "specials": np.array(specials, np.int32),
+        "cards": np.array(cards, np.int32).reshape(-1, 4),
+        "card_texts": np.array(card_texts, dtype=np.str_),
+    }
+
+
+def _write_tables(f, tables: dict[str, np.ndarray]) -> None:
+    offset = _HEADER.size + _TABLE.size * len(tables)
+    entries, blobs = [], []
+    for name, array in tables.items():
+        offset += -offset % _ALIGN
+        shape = (*array.shape, *(0,) * (4 - array.ndim))
+        entries.append(
+            _TABLE.pack(
+                name.encode(), array.dtype.str.encode(), array.ndim, *shape, offset
+            )
+        )
+        blobs.append((offset, np.ascontiguousarray(array).tobytes()))
+        offset += array.nbytes
+    f.write(_HEADER.pack(_MAGIC, VERSION, len(tables)))
+    for entry in entries:
+        f.write(entry)
+    for offset, blob in blobs:
+        f.write(b"\0" * (offset - f.tell()))
+        f.write(blob)
+
+
+def _read_tables(buf: Union[bytes, mmap.mmap]) -> dict[str, np.ndarray]:
+    magic, version, count = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != VERSION:
+        raise EditionError(f"not a version {VERSION} edition cache")
+    tables = {}
+    for i in range(count):
+        name, dtype, ndim, *shape, offset = _TABLE.unpack_from(
+            buf, _HEADER.size + i * _TABLE.size
+        )
+        shape = tuple(shape[:ndim])
+        dtype = np.dtype(dtype.rstrip(b"\0").decode())
+        size = int(np.prod(shape))
+        tables[name.rstrip(b"\0").decode()] = (
+            np.frombuffer(buf, dtype, size, offset).reshape(shape)
+            if size
+            else np.zeros(shape, dtype)
+        )
+    return tables
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="monopoly-simulator-edition",
+        description="Compile board editions into the cache next to their source",
+    )
+    parser.add_argument("editions", nargs="+", help="edition names or paths")
+    args = parser.parse_args()
+    for name in args.editions:
+        source = os.path.abspath(_source(name))
+        path = os.path.join(os.path.dirname(source), "__cache__", _cache_name(source))
+        compile_edition(source, path)
+        print(path)
@@ -1,21 +1,41 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from random import randint
-from typing import Callable, Optional
+from random import Random
+from typing import Callable, Optional, Union
 
 from cards import Deck, Card
+from edition import DeckKind, Edition, Kind, Op, load as load_edition
+from history import History
+from ledger import BANK, Flow, Ledger
+from seeding import game_seed
 import spaces
 from spaces import Space
 import logging
 from player import Player
 
+logger = logging.getLogger(__name__)
 
-def simulate(player_count: int = 4, max_turns: int = 100, plot: bool = False) -> int:
+
+def simulate(
+    player_count: int = 4,
+    max_turns: Optional[int] = 100,
+    plot: bool = False,
+    seed: Optional[int] = None,
+    index: Optional[int] = None,
+    edition: Union[str, Edition, None] = None,
+) -> int:
     """
     Run a simulated monopoly game, optionally plotting the money each player has over time.
     Returns the number of turns in the game before a single player wins or the max turn count is reached.
+
+    Given an `index`, replays game `index` of the campaign (or batch) seeded with `seed` exactly.
+    The game is played on `edition` (an `Edition`, or a name or path, see `edition.load`) if given.
     """
-    game = Game(player_count, max_turns)
+    if index is not None:
+        seed = game_seed(seed or 0, index)
+    if isinstance(edition, str):
+        edition = load_edition(edition)
+    game = Game(player_count, max_turns, seed=seed, edition=edition)
     nturns = game.run()
     if plot:
         game.plot()
@@ -23,123 +43,127 @@ def simulate(player_count: int = 4, max_turns: int = 100, plot: bool = False) ->
 
 
 class Game:
-    def __init__(self, player_count: int = 4, max_turns: int = 100) -> None:
+    def __init__(
+        self,
+        player_count: int = 4,
+        max_turns: Optional[int] = 100,
+        history_every: int = 1,
+        history_on_change: bool = False,
+        seed: Optional[int] = None,
+        antithetic: bool = False,
+        edition: Optional[Edition] = None,
+    ) -> None:
+        """
+        Set `max_turns` to None to play until there's a winner. The bank never runs out of money,
+        so some games never produce one, and `run()` then never returns (with its history
+        growing all the while); only use None interactively. Player money is recorded every
+        `history_every` turns, or only on turns where it changed if `history_on_change` is set
+        (see `History`). Games with the same `seed` play out the same.
+
+        Dice, each deck and utility rent rolls draw from separate random streams, so two games
+        with the same seed see the same dice and cards even if their rules make them consume
+        different amounts of randomness elsewhere. With `antithetic`, every die shows 7 minus what
+        it would have shown otherwise.
+
+        The board and cards come from `edition` (see `edition.load`), the standard board if unset.
+        """
+        rng = Random(seed)
+        self._dice_rng = Random(rng.getrandbits(64))
+        self._rent_rng = Random(rng.getrandbits(64))
+        chance_rng = Random(rng.getrandbits(64))
+        community_rng = Random(rng.getrandbits(64))
+        self._antithetic = antithetic
         self._player_count = player_count
         self._max_turns = max_turns
         self._turn = 0
-        self._history = np.zeros((self._max_turns, player_count), np.int32)
-        self._players = [Player(i) for i in range(1, player_count + 1)]
-        self._board = spaces.board()
-        self._chance_deck = Deck(
-            [
-                Card(
-                    "Advance to Boardwalk",
-                    _advance_to(spaces.BOARDWALK, pay_on_pass_go=False),
-                ),
-                Card("Advance to Go (Collect $200)", _advance_to(spaces.GO)),
-                Card(
-                    "Advance to Illinois Avenue. If you pass Go, collect $200",
-                    _advance_to(spaces.ILLINOIS_AVENUE),
-                ),
-                Card(
-                    "Advance to St. Charles Place. If you pass Go, collect $200",
-                    _advance_to(spaces.ST_CHARLES_PLACE),
-                ),
-                Card(
-                    "Advance to the nearest Railroad. If unowned, you may buy it from the Bank. If owned, pay wonder twice the rental to which they are otherwise entitled",
-                    _advance_to_railroad,
-                ),
-                Card(
-                    "Advance to the nearest Railroad. If unowned, you may buy it from the Bank. If owned, pay wonder twice the rental to which they are otherwise entitled",
-                    _advance_to_railroad,
-                ),
-                Card(
-                    "Advance token to nearest Utility. If unowned, you may buy it from the Bank. If owned, throw dice and pay owner a total ten times amount thrown.",
-                    _advance_to_utility,
-                ),
-                Card("Bank pays you dividend of $50", _payout(50)),
-                Card("Get Out of Jail Free", _receive_get_out_of_jail_free),
-                Card("Go Back 3 Spaces", self._go_back_three_spaces(self._board)),
-                Card(
-                    "Go to Jail. Go directly to Jail, do not pass Go, do not collect $200",
-                    _go_to_jail,
-                ),
-                Card(
-                    "Make general repairs on all your property. For each house pay $25. For each hotel pay $100",
-                    lambda p: self._make_repairs(p, 25, 100),
-                ),
-                Card("Speeding fine $15", lambda p: self._pay(15, p)),
-                Card(
-                    "Take a trip to Reading Railroad. If you pass Go, collect $200",
-                    _advance_to(spaces.READING_RAILROAD),
-                ),
-                Card(
-                    "You have been elected Chairman of the Board. Pay each player $50",
-                    self._elected_chairman_of_board,
-                ),
-                Card(
-                    "Your building loan matures. Collect $150",
-                    _payout(150),
-                ),
-            ]
-        )
-        self.community_deck = Deck(
-            [
-                Card("Advance to Go (Collect $200)", _advance_to(spaces.GO)),
-                Card("Bank error in your favor. Collect $200", _payout(200)),
-                Card("Doctor’s fee. Pay $50", lambda p: self._pay(50, p)),
-                Card("From sale of stock you get $50", _payout(50)),
-                Card("Get Out of Jail Free", _receive_get_out_of_jail_free),
-                Card(
-                    "Go to Jail. Go directly to jail, do not pass Go, do not collect $200",
-                    _go_to_jail,
-                ),
-                Card("Holiday fund matures. Receive $100", _payout(100)),
-                Card("Income tax refund. Collect $20", _payout(20)),
-                Card(
-                    "It is your birthday. Collect $10 from every player",
-                    self._it_is_your_birthday,
-                ),
-                Card("Life insurance matures. Collect $100", _payout(100)),
-                Card("Pay hospital fees of $100", lambda p: self._pay(100, p)),
-                Card("Pay school fees of $50", lambda p: self._pay(50, p)),
-                Card("Receive $25 consultancy fee", _payout(25)),
-                Card(
-                    "You are assessed for street repair. $40 per house. $115 per hotel",
-                    lambda p: self._make_repairs(p, 40, 115),
-                ),
-                Card(
-                    "You have won second prize in a beauty contest. Collect $10",
-                    _payout(10),
-                ),
-                Card("You inherit $100", _payout(100)),
-            ]
+        self._history = History(
+            player_count, every=history_every, on_change=history_on_change
         )
+        self._players = [Player(i) for i in range(1, player_count + 1)]
+        self._edition = edition or spaces.STANDARD
+        self._board = spaces.board(self._edition)
+        self._landings = np.zeros(len(self._board), np.int64)
+        self._ledger = Ledger(len(self._board), player_count)
+        self._chance_deck = self._deck(DeckKind.CHANCE, chance_rng)
+        self.community_deck = self._deck(DeckKind.COMMUNITY_CHEST, community_rng)
 
     def run(self) -> int:
         """
         Run a new game until either a single player wins or the max number of turns is reached.
         """
-        while len(self._players) > 1 and self._turn < self._max_turns:
+        while len(self._players) > 1 and (
+            self._max_turns is None or self._turn < self._max_turns
+        ):
             self._turn += 1
+            money = np.zeros(self._player_count, np.int32)
             for player in self._players:
                 self._take_turn(player)
-                self._history[self._turn - 1, player.id - 1] = player.money
+                money[player.id - 1] = player.money
+            self._history.record(self._turn, money)
             self._players = [p for p in self._players if p.money > 0]
-            logging.debug(f"End of turn {self._turn}: {self._players}")
+            logger.debug(f"End of turn {self._turn}: {self._players}")
+        self._history.close()
         if self._turn == self._max_turns:
-            logging.debug(f"Max turn count reached: {self._turn}")
-            logging.debug(f"Final state: {self._players}")
+            logger.debug(f"Max turn count reached: {self._turn}")
+            logger.debug(f"Final state: {self._players}")
             return self._turn
-        logging.info(f"Winner: {self._players} | Turns: {self._turn}")
+        logger.info(f"Winner: {self._players} | Turns: {self._turn}")
         return self._turn
 
+    @property
+    def finished(self) -> bool:
+        """
+        Whether the game ended with a single winner (rather than hitting the max turn count).
+        """
+        return len(self._players) <= 1
+
+    @property
+    def player_count(self) -> int:
+        return self._player_count
+
+    @property
+    def max_turns(self) -> Optional[int]:
+        return self._max_turns
+
+    @property
+    def players(self) -> list[Player]:
+        """
+        Players still in the game.
+        """
+        return self._players
+
+    @property
+    def board(self) -> list[Space]:
+        return self._board
+
+    @property
+    def history(self) -> History:
+        """
+        Money of each player over the course of the game.
+        """
+        return self._history
+
+    @property
+    def ledger(self) -> Ledger:
+        """
+        Money paid for and collected from each space, and paid between players and the bank.
+        """
+        return self._ledger
+
+    @property
+    def landings(self) -> np.ndarray:
+        """
+        How many times a player has landed on each space, indexed by space.
+        """
+        return self._landings
+
     def plot(self) -> None:
         """
         Plot player money over time. This should only be called after the game has been simulated.
         """
+        turns, money = self._history.turns, self._history.money
         for i in range(self._player_count):
-            plt.plot(self._history[: self._turn, i], label=f"Player {i + 1}")
+            plt.plot(turns, money[:, i], label=f"Player {i + 1}")
         plt.xlabel("Turn Count")
         plt.ylabel("Money")
         plt.title("Player money over time")
@@ -150,7 +174,7 @@ class Game:
         """
         Bankrupt a player, optionally paying out debts to another player.
         """
-        logging.debug(f"Player {player.id} has gone bankrupt and is exiting the game")
+        logger.debug(f"Player {player.id} has gone bankrupt and is exiting the game")
         player.money = 0
         for space in _owned_spaces(self._board, player):
             space.owned_by = pay_to.id if pay_to else None
@@ -158,41 +182,141 @@ class Game:
             space.hotel = False
             space.mortgaged = False
 
-    def _pay(
-        self, amount: int, player: Player, pay_to: Optional[Player] = None
-    ) -> None:
+    def _pay(self, amount: int, player: Player, pay_to: Optional[Player] = None) -> int:
+        """
+        Returns the amount actually paid, which is less than `amount` if the player goes bankrupt.
+        """
         if player.money <= amount:
             # TODO: try to mortgage properties, etc. to avoid bankruptcy
+            paid = player.money
             if pay_to:
-                pay_to.money += player.money
-            return self._bankrupt(player, pay_to)
-        logging.debug(
+                pay_to.money += paid
+            self._ledger.transfer(player.id, pay_to.id if pay_to else BANK, paid)
+            self._bankrupt(player, pay_to)
+            return paid
+        logger.debug(
             f"Player {player.id} pays ${amount} to {pay_to.id if pay_to else 'the bank'}"
         )
         if pay_to:
             pay_to.money += amount
         player.money -= amount
+        self._ledger.transfer(player.id, pay_to.id if pay_to else BANK, amount)
+        return amount
+
+    def _collect(self, amount: int, player: Player) -> None:
+        """
+        Pay `amount` from the bank to `player`
+        """
+        player.money += amount
+        self._ledger.transfer(BANK, player.id, amount)
 
     def _buy_houses_and_hotels(self, player: Player) -> None:
         # TODO: strategic property-buying
-        for space in _owned_spaces(self._board, player):
-            _buy_houses_and_hotels_on_space(self._board, player, space)
+        for i, space in enumerate(self._board):
+            if space.owned_by != player.id:
+                continue
+            if spent := _buy_houses_and_hotels_on_space(self._board, player, space):
+                self._ledger.record(i, Flow.BUILDING, spent)
+                self._ledger.transfer(player.id, BANK, spent)
+
+    def _deck(self, kind: DeckKind, rng: Random) -> Deck:
+        return Deck(
+            [
+                Card(text, self._card_effect(op, arg0, arg1))
+                for text, op, arg0, arg1 in self._edition.cards(kind)
+            ],
+            rng,
+        )
 
-    def _elected_chairman_of_board(self, p: Player):
+    def _card_effect(self, op: Op, arg0: int, arg1: int) -> Callable:
+        """
+        Chance Card/Community Chest effect for a compiled card (see `edition.Op`)
+        """
+        match op:
+            case Op.ADVANCE_TO:
+                return self._advance_to(arg0, pay_on_pass_go=bool(arg1))
+            case Op.ADVANCE_TO_RAILROAD:
+                return self._advance_to_railroad()
+            case Op.ADVANCE_TO_UTILITY:
+                return self._advance_to_utility()
+            case Op.COLLECT:
+                return lambda p: self._collect(arg0, p)
+            case Op.PAY:
+                return lambda p: self._pay(arg0, p)
+            case Op.GET_OUT_OF_JAIL_FREE:
+                return _receive_get_out_of_jail_free
+            case Op.GO_BACK:
+                return self._go_back(arg0)
+            case Op.GO_TO_JAIL:
+                return _go_to_jail(self._edition.jail)
+            case Op.REPAIRS:
+                return lambda p: self._make_repairs(p, arg0, arg1)
+            case Op.PAY_EACH_PLAYER:
+                return self._elected_chairman_of_board(arg0)
+            case Op.COLLECT_FROM_EACH_PLAYER:
+                return self._it_is_your_birthday(arg0)
+            case _:
+                raise AssertionError(f"unknown card effect {op}")
+
+    def _advance_to(self, space_i: int, pay_on_pass_go: bool = True) -> Callable:
         """
         Chance Card/Community Chest
         """
-        for other_player in self._players:
-            if other_player.id != p.id:
-                self._pay(50, p, other_player)
 
-    def _go_back_three_spaces(self, board: list[Space]) -> Callable:
+        def _inner(p: Player) -> None:
+            if p.space > space_i and pay_on_pass_go:
+                self._collect(200, p)
+            p.space = space_i
+
+        return _inner
+
+    def _advance_to_railroad(self) -> Callable:
+        """
+        Chance Card
+        """
+
+        def _inner(p: Player) -> None:
+            railroad = spaces.next_railroad(p.space, self._edition.railroads)
+            if p.space > railroad:
+                self._collect(200, p)
+            p.space = railroad
+            logger.debug("TODO: buy railroad")
+
+        return _inner
+
+    def _advance_to_utility(self) -> Callable:
+        """
+        Chance Card
+        """
+
+        def _inner(p: Player) -> None:
+            utility = spaces.next_utility(p.space, self._edition.utilities)
+            if p.space > utility:
+                self._collect(200, p)
+            p.space = utility
+            logger.debug("TODO: buy utility")
+
+        return _inner
+
+    def _elected_chairman_of_board(self, amount: int) -> Callable:
         """
         Chance Card/Community Chest
         """
 
         def _inner(p: Player) -> None:
-            p.space = (p.space - 3) % len(board)
+            for other_player in self._players:
+                if other_player.id != p.id:
+                    self._pay(amount, p, other_player)
+
+        return _inner
+
+    def _go_back(self, count: int) -> Callable:
+        """
+        Chance Card/Community Chest
+        """
+
+        def _inner(p: Player) -> None:
+            p.space = (p.space - count) % len(self._board)
             self._interact_with_space(p)
 
         return _inner
@@ -201,91 +325,109 @@ class Game:
         """
         Chance Card/Community Chest
         """
-        amount = sum(
-            price_per_hotel if s.hotel else price_per_house * s.houses
-            for s in _owned_spaces(self._board, p)
-        )
-        self._pay(amount, p)
-
-    def _it_is_your_birthday(self, p: Player):
+        charges = {
+            i: price_per_hotel if s.hotel else price_per_house * s.houses
+            for i, s in enumerate(self._board)
+            if s.owned_by == p.id
+        }
+        amount = sum(charges.values())
+        paid = self._pay(amount, p)
+        for i, charge in charges.items():
+            if charge:
+                # Split what was paid across the spaces if the player went bankrupt
+                self._ledger.record(i, Flow.REPAIRS, charge * paid // amount)
+
+    def _it_is_your_birthday(self, amount: int) -> Callable:
         """
         Chance Card/Community Chest
         """
-        for other_player in self._players:
-            if other_player.id != p.id:
-                self._pay(50, other_player, p)
+
+        def _inner(p: Player) -> None:
+            for other_player in self._players:
+                if other_player.id != p.id:
+                    self._pay(amount, other_player, p)
+
+        return _inner
 
     def _interact_with_space(self, player: Player):
         space = self._board[player.space]
+        self._landings[player.space] += 1
         # Buy unpurchased spaces
         if space.meta.buying_price and not space.owned_by:
             if player.money <= space.meta.buying_price:
                 return
-            logging.debug(
+            logger.debug(
                 f"Player {player.id} purchasing {space.meta.name} for {space.meta.buying_price}"
             )
-            self._pay(space.meta.buying_price, player)
+            paid = self._pay(space.meta.buying_price, player)
+            self._ledger.record(player.space, Flow.PURCHASE, paid)
             space.owned_by = player.id
             return
         # Pay rent
         if space.owned_by and space.owned_by != player.id:
-            rent = spaces.rent_value(self._board, space)
+            rent = spaces.rent_value(self._board, space, self._rent_rng)
             other = next(p for p in self._players if p.id == space.owned_by)
-            self._pay(space.meta.buying_price, player, other)
-            logging.debug(
+            paid = self._pay(rent, player, other)
+            self._ledger.record(player.space, Flow.RENT, paid)
+            logger.debug(
                 f"Player {player.id} paid rent of ${rent} to Player {space.owned_by} for {space.meta.name}"
             )
         # Special cases
-        match player.space:
-            case spaces.GO_TO_JAIL:
-                logging.debug(
+        match self._edition.kinds[player.space]:
+            case Kind.GO_TO_JAIL:
+                logger.debug(
                     f"Player {player.id}, go to jail! (Landed on 'Go To Jail')"
                 )
-                player.space = spaces.JAIL
+                player.space = self._edition.jail
                 player.jail_sentence = 3
-            case spaces.FREE_PARKING:
+            case Kind.FREE_PARKING:
                 # In some variants, you receive money on this space, but house rules say
                 # that this space is effectively a no-op: you don't need to pay rent when
                 # landing here, which is the "feature" if this space, per se.
                 ...
-            case spaces.INCOME_TAX:
-                self._pay(200, player)
-            case spaces.LUXURY_TAX:
-                self._pay(100, player)
-            case s if s in list(spaces.CHANCES):
+            case Kind.TAX:
+                tax = self._edition.taxes[player.space]
+                self._ledger.record(player.space, Flow.TAX, self._pay(tax, player))
+            case Kind.CHANCE:
                 card = self._chance_deck.draw()
-                logging.debug(f"Chance time for Player {player.id}: {card.name}")
+                logger.debug(f"Chance time for Player {player.id}: {card.name}")
                 card.effect(player)
-            case s if s in list(spaces.COMMUNITY_CHESTS):
+            case Kind.COMMUNITY_CHEST:
                 card = self.community_deck.draw()
-                logging.debug(f"Chance time for Player {player.id}: {card.name}")
+                logger.debug(f"Chance time for Player {player.id}: {card.name}")
                 card.effect(player)
 
+    def _roll(self) -> tuple[int, int]:
+        roll1, roll2 = self._dice_rng.randint(1, 6), self._dice_rng.randint(1, 6)
+        if self._antithetic:
+            return 7 - roll1, 7 - roll2
+        return roll1, roll2
+
     def _take_turn(self, player: Player, remaining_rolls=3):
-        roll1, roll2 = randint(1, 6), randint(1, 6)
+        roll1, roll2 = self._roll()
         rolled_doubles = roll1 == roll2
 
         if not rolled_doubles and player.jail_sentence > 0:
             player.jail_sentence -= 1
-            logging.debug(
+            logger.debug(
                 f"Player {player.id} is in jail and can't  move ({player.jail_sentence} turns remaining)"
             )
             self._buy_houses_and_hotels(player)
             return
 
         if rolled_doubles and remaining_rolls < 1:
-            logging.debug(f"Player {player.id}, go to jail! (Triple-Doubles)")
-            player.space = spaces.JAIL
+            logger.debug(f"Player {player.id}, go to jail! (Triple-Doubles)")
+            player.space = self._edition.jail
             return
 
         inext = sum((player.space, roll1, roll2))
         passed_go = inext >= len(self._board)
         player.space = inext % len(self._board)
-        player.money += passed_go * 200
         if passed_go:
-            logging.debug(f"Player {player.id} has passed GO and collected $200")
-        logging.debug(
-            f"Player {player.id} landed on space {spaces._space_name(player.space)}"
+            self._collect(200, player)
+            logger.debug(f"Player {player.id} has passed GO and collected $200")
+        logger.debug(
+            f"Player {player.id} landed on space {self._board[player.space].meta.name}"
         )
 
         self._interact_with_space(player)
@@ -303,71 +445,46 @@ def _owned_spaces(board: list[Space], player: Player) -> list[Space]:
 
 def _buy_houses_and_hotels_on_space(
     board: list[Space], player: Player, space: Space
-) -> None:
+) -> int:
+    """
+    Returns the amount spent on buildings.
+    """
     # railroads, utilities can be purchased, but houses cannot be built on them
     if not space.meta.building_price:
-        return
+        return 0
     assert space.meta.color is not None, "Color expected on space when buying property"
     assert space.owned_by is not None, "When buying houses/hotels, space must be owned"
     assert space.owned_by == player.id, "Player must own space to buy property"
     # Player can only buy houses if they own all of that color
     if not spaces.player_owns_all_color(board, space.meta.color, space.owned_by):
-        return
+        return 0
     if player.money <= space.meta.building_price or space.hotel:
-        return
+        return 0
     player.money -= space.meta.building_price
     if space.houses < 4:
         space.houses += 1
-        logging.debug(
+        logger.debug(
             f"Player {player.id} purchased house on {space.meta.name} for ${space.meta.building_price}"
         )
-        return
+        return space.meta.building_price
     space.houses = 0
     space.hotel = True
-    logging.debug(
+    logger.debug(
         f"Player {player.id} purchased hotel on {space.meta.name} for ${space.meta.building_price}"
     )
+    return space.meta.building_price
 
 
 # Community Chest/Chance Cards
 
 
-def _advance_to(space_i: int, pay_on_pass_go: bool = True) -> Callable:
-    def _inner(p: Player) -> None:
-        if p.space > space_i and pay_on_pass_go:
-            p.money += 200
-        p.space = space_i
-
-    return _inner
+def _receive_get_out_of_jail_free(p: Player):
+    p.get_out_of_jail_cards += 1
 
 
-def _payout(amount: int) -> Callable:
+def _go_to_jail(jail: int) -> Callable:
     def _inner(p: Player) -> None:
-        p.money += amount
+        p.space = jail
+        p.jail_sentence = 3
 
     return _inner
-
-
-def _advance_to_railroad(p: Player):
-    railroad = spaces.next_railroad(p.space)
-    if p.space > railroad:
-        p.money += 200
-    p.space = railroad
-    logging.debug("TODO: buy railroad")
-
-
-def _advance_to_utility(p: Player):
-    utility = spaces.next_utility(p.space)
-    if p.space > utility:
-        p.money += 200
-    p.space = utility
-    logging.debug("TODO: buy utility")
-
-
-def _receive_get_out_of_jail_free(p: Player):
-    p.get_out_of_jail_cards += 1
-
-
-def _go_to_jail(p: Player):
-    p.space = spaces.JAIL
-    p.jail_sentence = 3
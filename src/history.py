@@ -0,0 +1,98 @@
+import numpy as np
+from typing import Optional
+
+
+class History:
+    """
+    Record of each player's money over the course of a game.
+
+    Rows are stored in fixed-size chunks that are only allocated as the game goes on, so memory
+    matches the actual game length rather than the max turn count. Set `every` to record only
+    every k-th turn, or `on_change` to record a turn only when somebody's money changed. The
+    last turn of the game is always recorded (see `close()`).
+    """
+
+    def __init__(
+        self,
+        player_count: int,
+        chunk_size: int = 64,
+        every: int = 1,
+        on_change: bool = False,
+    ) -> None:
+        assert chunk_size > 0, "chunk size must be positive"
+        assert every > 0, "recording interval must be positive"
+        self._player_count = player_count
+        self._chunk_size = chunk_size
+        self._every = every
+        self._on_change = on_change
+        self._chunks: list[np.ndarray] = []
+        self._turn_chunks: list[np.ndarray] = []
+        self._len = 0
+        self._last: Optional[np.ndarray] = None
+        self._pending: Optional[tuple[int, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return self._len
+
+    def record(self, turn: int, money: np.ndarray) -> None:
+        """
+        Offer the money of every player (indexed by player id - 1) at the end of `turn`.
+        """
+        if turn % self._every or (
+            self._on_change
+            and self._last is not None
+            and np.array_equal(self._last, money)
+        ):
+            # Hold on to it in case it turns out to be the final turn
+            self._pending = (turn, money)
+            return
+        self._append(turn, money)
+
+    def close(self) -> None:
+        """
+        Make sure the final turn offered to `record()` is stored.
+        """
+        if self._pending is not None:
+            self._append(*self._pending)
+
+    @property
+    def turns(self) -> np.ndarray:
+        """
+        Turn numbers (starting from 1) of the recorded rows.
+        """
+        if not self._turn_chunks:
+            return np.zeros(0, np.int32)
+        return np.concatenate(self._turn_chunks)[: self._len]
+
+    @property
+    def money(self) -> np.ndarray:
+        """
+        Recorded money as a (recorded turns, player count) array.
+        """
+        if not self._chunks:
+            return np.zeros((0, self._player_count), np.int32)
+        return np.concatenate(self._chunks)[: self._len]
+
+    def dense(self) -> np.ndarray:
+        """
+        Money as a (turns, player count) array with one row per turn. Turns that weren't recorded
+        take the most recent recorded row (or the first one, for turns before it).
+        """
+        turns = self.turns
+        if not len(turns):
+            return np.zeros((0, self._player_count), np.int32)
+        rows = np.searchsorted(turns, np.arange(1, turns[-1] + 1), side="right") - 1
+        return self.money[np.maximum(rows, 0)]
+
+    def _append(self, turn: int, money: np.ndarray) -> None:
+        i = self._len % self._chunk_size
+        if i == 0:
+            self._chunks.append(
+                np.zeros((self._chunk_size, self._player_count), np.int32)
+            )
+            self._turn_chunks.append(np.zeros(self._chunk_size, np.int32))
+        self._chunks[-1][i] = money
+        self._turn_chunks[-1][i] = turn
+        self._len += 1
+        self._last = self._chunks[-1][i]
+        self._pending = None
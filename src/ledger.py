@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+
+import numpy as np
+
+from edition import Edition
+import spaces
+
+# Payer/payee index of the bank in transfers (players are indexed by their id)
+BANK = 0
+
+
+class Flow(IntEnum):
+    PURCHASE = 0
+    BUILDING = 1
+    RENT = 2
+    REPAIRS = 3
+    TAX = 4
+
+
+_FLOWS = len(Flow)
+
+
+class Ledger:
+    """
+    Cash flows of a single game, by (space, kind of flow) and by (payer, payee).
+
+    Everything is kept in flat lists of ints of a fixed size, so recording a flow costs an index
+    and an add. Use `LedgerTotals` to add up the ledgers of many games.
+    """
+
+    def __init__(self, space_count: int, player_count: int) -> None:
+        self._parties = player_count + 1
+        self.flows = [0] * (space_count * _FLOWS)
+        self.transfers = [0] * (self._parties * self._parties)
+
+    def record(self, space: int, flow: int, amount: int) -> None:
+        self.flows[space * _FLOWS + flow] += amount
+
+    def transfer(self, payer: int, payee: int, amount: int) -> None:
+        self.transfers[payer * self._parties + payee] += amount
+
+
+@dataclass
+class PropertyReturn:
+    name: str
+    purchase: int
+    building: int
+    repairs: int
+    rent: int
+
+    @property
+    def cost(self) -> int:
+        return self.purchase + self.building + self.repairs
+
+    @property
+    def net(self) -> int:
+        return self.rent - self.cost
+
+    @property
+    def roi(self) -> float:
+        return self.net / self.cost if self.cost else float("nan")
+
+
+class LedgerTotals:
+    """
+    Mergeable sum of the ledgers of any number of games played with the same player count and
+    edition (the standard board if unset).
+    """
+
+    def __init__(self, player_count: int = 4, edition: Optional[Edition] = None):
+        self._edition = edition or spaces.STANDARD
+        self.games = 0
+        # Indexed by [space, Flow]
+        self.flows = np.zeros((len(self._edition), _FLOWS), np.int64)
+        # Indexed by [payer, payee], where the bank is BANK and players are their id
+        self.transfers = np.zeros((player_count + 1, player_count + 1), np.int64)
+
+    def add(self, ledger: Ledger) -> None:
+        self.games += 1
+        self.flows += np.reshape(ledger.flows, self.flows.shape)
+        self.transfers += np.reshape(ledger.transfers, self.transfers.shape)
+
+    def merge(self, other: "LedgerTotals") -> "LedgerTotals":
+        self.games += other.games
+        self.flows += other.flows
+        self.transfers += other.transfers
+        return self
+
+    def roi(self) -> list[PropertyReturn]:
+        """
+        Money spent on and collected from each purchasable space, in board order.
+        """
+        return [
+            PropertyReturn(
+                meta.name,
+                *(
+                    int(self.flows[i, flow])
+                    for flow in (Flow.PURCHASE, Flow.BUILDING, Flow.REPAIRS, Flow.RENT)
+                ),
+            )
+            for i, meta in enumerate(spaces.metas(self._edition))
+            if meta.buying_price
+        ]
@@ -1,17 +1,36 @@
 from argparse import ArgumentParser
 import logging
+import random
 import statistics
+from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 
-import game
+import capture
+from distributed import Chunk, run_chunk
 
 
-def monte_carlo_game_length():
+def monte_carlo_game_length(
+    seed: Optional[int] = None, capture_dir: Optional[str] = None
+):
     ngames = 10_000
-    game_lengths = [game.simulate() for _ in range(ngames)]
+    seed = random.getrandbits(64) if seed is None else seed
+    reservoir = (
+        capture.Reservoir(capture_dir, {"unfinished": capture.unfinished})
+        if capture_dir
+        else None
+    )
+    summary = run_chunk(Chunk(seed, 0, ngames, 4, 100), reservoir)
+    if reservoir:
+        reservoir.close()
+    game_lengths = sorted(summary.lengths.elements())
     game_lengths = [gl for gl in game_lengths if gl < 100]
+    logging.info(
+        f"Seed {seed}: left out {summary.games - len(game_lengths)} games of 100 turns or more"
+    )
+    if failed := ngames - summary.games:
+        logging.warning(f"{failed} games failed (see {capture_dir} for their errors)")
     average = np.mean(game_lengths, dtype=np.float64)
     logging.info(f"{np.mean(game_lengths)=}")
     logging.info(f"{np.median(game_lengths)=}")
@@ -44,7 +63,14 @@ if __name__ == "__main__":
     parser.add_argument(
         "-l", "--loglevel", default="INFO", choices=("INFO", "WARN", "ERROR")
     )
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument(
+        "-c",
+        "--capture",
+        default=None,
+        help="Directory to save a sample of the games that hit the max turn count to",
+    )
     args = parser.parse_args()
     logging.basicConfig(level=args.loglevel)
-    monte_carlo_game_length()
+    monte_carlo_game_length(args.seed, args.capture)
     # game.simulate(plot=True)
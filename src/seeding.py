@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def game_seed(seed: int, index: int) -> int:
+    """
+    Seed for game `index` of a campaign seeded with `seed`.
+
+    The seed is the output of a counter-based generator (Philox, keyed by the campaign seed) at
+    the game's index, so any game can be found directly, without generating the ones before it,
+    and games get unrelated seeds no matter which worker or chunk plays them.
+    """
+    words = np.random.Philox(key=seed % 2**128, counter=index).random_raw(2)
+    return int(words[0]) << 64 | int(words[1])
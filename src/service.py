@@ -0,0 +1,230 @@
+"""
+A long-running local simulation service.
+
+The service keeps a pool of worker processes warm (with the simulator already imported), so
+ad-hoc queries from notebooks and dashboards only pay for the games themselves. Clients connect
+over a Unix socket or a localhost port and speak newline-delimited JSON:
+
+    -> {"id": 1, "op": "simulate", "games": 10000, "player_count": 3, "max_turns": 150}
+    <- {"id": 1, "type": "partial", "summary": {...}}    (as chunks complete)
+    <- {"id": 1, "type": "done", "summary": {...}}
+    -> {"id": 1, "op": "cancel"}
+    <- {"id": 1, "type": "cancelled", "summary": {...}}
+
+Several jobs can run at once on one connection. A job spec may also set `seed` (game `i` of the
+job is played with seed `seeding.game_seed(seed, i)`), `chunk_size` and `edition` (a name or
+path, see `edition.load`). `max_turns` can't be null, as some games never end without a limit.
+
+    python service.py --address /tmp/monopoly.sock
+"""
+
+from argparse import ArgumentParser
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import json
+import logging
+import os
+import socket
+from typing import Iterator, Optional, Union
+
+from distributed import Chunk, run_chunk
+from stats import Summary
+
+Address = Union[str, tuple[str, int]]
+
+DEFAULT_ADDRESS = "/tmp/monopoly-simulator.sock"
+
+
+class Service:
+    def __init__(self, workers: Optional[int] = None) -> None:
+        self._workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(self._workers)
+        # Start the worker processes now rather than on the first job
+        for future in [self._pool.submit(_warm_up) for _ in range(self._workers)]:
+            future.result()
+
+    async def serve(self, address: Address = DEFAULT_ADDRESS) -> None:
+        """
+        Serve jobs on a Unix socket (given a path) or a TCP port (given a (host, port) pair).
+        """
+        if isinstance(address, str):
+            server = await asyncio.start_unix_server(self._handle, address)
+        else:
+            server = await asyncio.start_server(self._handle, *address)
+        logging.info(f"Serving on {address} with {self._workers} workers")
+        async with server:
+            await server.serve_forever()
+
+    def close(self) -> None:
+        self._pool.shutdown(cancel_futures=True)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        jobs: dict[object, asyncio.Task] = {}
+
+        async def send(message: dict) -> None:
+            writer.write(json.dumps(message).encode() + b"\n")
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("expected a JSON object")
+                    job_id, op = request.get("id"), request["op"]
+                    hash(job_id)  # jobs are looked up by id
+                except (ValueError, KeyError, TypeError) as e:
+                    await send({"type": "error", "error": f"bad request: {e!r}"})
+                    continue
+                match op:
+                    case "simulate" if job_id in jobs:
+                        await send(
+                            {
+                                "id": job_id,
+                                "type": "error",
+                                "error": f"job {job_id} is already running",
+                            }
+                        )
+                    case "simulate" if request.get("max_turns", 100) is None:
+                        # Some games never end without a turn limit, and a running chunk
+                        # can't be cancelled, so one would hold a worker forever
+                        await send(
+                            {
+                                "id": job_id,
+                                "type": "error",
+                                "error": "max_turns must be set",
+                            }
+                        )
+                    case "simulate":
+                        task = asyncio.create_task(self._run_job(job_id, request, send))
+                        jobs[job_id] = task
+                        task.add_done_callback(
+                            lambda _, job_id=job_id: jobs.pop(job_id)
+                        )
+                    case "cancel":
+                        if job_id in jobs:
+                            jobs[job_id].cancel()
+                    case _:
+                        await send(
+                            {"id": job_id, "type": "error", "error": f"unknown op {op}"}
+                        )
+        finally:
+            for task in jobs.values():
+                task.cancel()
+            writer.close()
+
+    async def _run_job(self, job_id: object, spec: dict, send) -> None:
+        summary = Summary()
+        pending: set[asyncio.Future] = set()
+        try:
+            games = spec.get("games", 10_000)
+            chunk_size = spec.get("chunk_size", max(1, min(200, games // 20)))
+            chunks = [
+                Chunk(
+                    spec.get("seed", 0),
+                    start,
+                    min(chunk_size, games - start),
+                    spec.get("player_count", 4),
+                    spec.get("max_turns", 100),
+                    spec.get("edition"),
+                )
+                for start in range(0, games, chunk_size)
+            ]
+            loop = asyncio.get_running_loop()
+            # Keep one small chunk per worker in flight, so jobs share the pool and a
+            # cancelled job doesn't leave a queue of work behind
+            while chunks or pending:
+                while chunks and len(pending) < self._workers:
+                    pending.add(
+                        loop.run_in_executor(self._pool, run_chunk, chunks.pop(0))
+                    )
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    summary.merge(future.result())
+                if pending or chunks:
+                    await send(
+                        {"id": job_id, "type": "partial", "summary": summary.to_dict()}
+                    )
+            await send({"id": job_id, "type": "done", "summary": summary.to_dict()})
+        except asyncio.CancelledError:
+            for future in pending:
+                future.cancel()
+            try:
+                await send(
+                    {"id": job_id, "type": "cancelled", "summary": summary.to_dict()}
+                )
+            except ConnectionError:
+                pass
+        except Exception as e:
+            for future in pending:
+                future.cancel()
+            logging.exception(f"Job {job_id} failed")
+            await send({"id": job_id, "type": "error", "error": repr(e)})
+
+
+def _warm_up() -> None:
+    pass
+
+
+def stream(spec: dict, address: Address = DEFAULT_ADDRESS) -> Iterator[dict]:
+    """
+    Submit a job to a running service and yield its messages until it finishes. Closing the
+    generator early cancels the job.
+    """
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    spec = {"id": 0, **spec, "op": "simulate"}
+    with socket.socket(family) as sock:
+        sock.connect(address)
+        with sock.makefile("rwb") as f:
+            f.write(json.dumps(spec).encode() + b"\n")
+            f.flush()
+            try:
+                for line in f:
+                    message = json.loads(line)
+                    yield message
+                    if message["type"] != "partial":
+                        return
+            except GeneratorExit:
+                f.write(json.dumps({"id": spec["id"], "op": "cancel"}).encode() + b"\n")
+                f.flush()
+                raise
+
+
+def _address(s: str) -> Address:
+    if ":" not in s:
+        return s
+    host, port = s.rsplit(":", 1)
+    return host, int(port)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(
+        prog="monopoly-simulator-service",
+        description="Serve Monopoly simulations from a warm pool of workers",
+    )
+    parser.add_argument(
+        "-a",
+        "--address",
+        type=_address,
+        default=DEFAULT_ADDRESS,
+        help="Unix socket path, or host:port",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument(
+        "-l", "--loglevel", default="INFO", choices=("INFO", "WARN", "ERROR")
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=args.loglevel)
+    if isinstance(args.address, str) and os.path.exists(args.address):
+        os.unlink(args.address)
+    service = Service(args.workers)
+    try:
+        asyncio.run(service.serve(args.address))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
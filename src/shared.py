@@ -0,0 +1,182 @@
+"""
+Batch runs that aggregate straight into shared memory.
+
+Each worker process gets its own partition of a set of NumPy arrays backed by
+`multiprocessing.shared_memory`, and adds every game it plays into them in place. Nothing is sent
+back per game (or per chunk); the parent sums the partitions once all workers are done.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Optional
+
+import numpy as np
+
+from edition import load as load_edition
+from game import Game
+from seeding import game_seed
+import spaces
+from stats import MoneyOverTime, Summary
+
+
+@dataclass
+class Aggregates:
+    # Landings on each space, indexed by space
+    landings: np.ndarray
+    # Game counts indexed by game length
+    lengths: np.ndarray
+    # Money of each seat at each turn, in the same bins as a `MoneyOverTime` built by hand
+    money: MoneyOverTime
+    unfinished: int = 0
+
+    @property
+    def games(self) -> int:
+        return int(self.lengths.sum())
+
+    def merge(self, other: "Aggregates") -> "Aggregates":
+        self.landings += other.landings
+        self.lengths += other.lengths
+        self.money.merge(other.money)
+        self.unfinished += other.unfinished
+        return self
+
+    def summary(self) -> Summary:
+        summary = Summary(self.games, self.unfinished)
+        summary.lengths.update(
+            {n: int(count) for n, count in enumerate(self.lengths) if count}
+        )
+        return summary
+
+
+# Name, shape of each shared array (without the leading worker axis)
+_Layout = list[tuple[str, tuple[int, ...]]]
+
+
+def _layout(
+    space_count: int, max_turns: int, player_count: int, money_bins: int
+) -> _Layout:
+    return [
+        ("landings", (space_count,)),
+        ("lengths", (max_turns + 1,)),
+        ("money", (max_turns, player_count, money_bins)),
+        ("unfinished", (1,)),
+    ]
+
+
+def _attach(shm: SharedMemory, layout: _Layout, workers: int) -> dict[str, np.ndarray]:
+    arrays, offset = {}, 0
+    for name, shape in layout:
+        array = np.ndarray((workers, *shape), np.int64, shm.buf, offset)
+        arrays[name] = array
+        offset += array.nbytes
+    return arrays
+
+
+def _size(layout: _Layout, workers: int) -> int:
+    return sum(
+        workers * int(np.prod(shape)) * np.dtype(np.int64).itemsize
+        for _, shape in layout
+    )
+
+
+def _work(
+    shm_name: str,
+    layout: _Layout,
+    workers: int,
+    worker: int,
+    games: range,
+    seed: int,
+    player_count: int,
+    max_turns: int,
+    money_bin_width: int,
+    edition: Optional[str],
+) -> None:
+    board = load_edition(edition) if edition else None
+    shm = SharedMemory(shm_name)
+    try:
+        arrays = {k: v[worker] for k, v in _attach(shm, layout, workers).items()}
+        money = MoneyOverTime(
+            player_count,
+            money_bin_width,
+            arrays["money"].shape[-1],
+            counts=arrays["money"],
+        )
+        for i in games:
+            game = Game(player_count, max_turns, seed=game_seed(seed, i), edition=board)
+            nturns = game.run()
+            arrays["landings"] += game.landings
+            arrays["lengths"][nturns] += 1
+            arrays["unfinished"][0] += not game.finished
+            money.add(game.history)
+        # The views must go before the shared memory can be closed
+        del arrays, money
+    finally:
+        shm.close()
+
+
+def simulate_shared(
+    games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    player_count: int = 4,
+    max_turns: int = 100,
+    money_bin_width: int = 50,
+    money_bins: int = 200,
+    edition: Optional[str] = None,
+) -> Aggregates:
+    """
+    Play `games` games across `workers` processes, aggregating landings, game lengths and
+    money over time (as a `MoneyOverTime` with `money_bins` bins of `money_bin_width`) in
+    shared memory. Game `i` is played with seed `game_seed(seed, i)`, on
+    `edition` (a name or path, see `edition.load`) if given.
+    """
+    workers = workers or os.cpu_count() or 1
+    space_count = len(load_edition(edition) if edition else spaces.STANDARD)
+    layout = _layout(space_count, max_turns, player_count, money_bins)
+    shm = SharedMemory(create=True, size=_size(layout, workers))
+    try:
+        arrays = _attach(shm, layout, workers)
+        for array in arrays.values():
+            array[:] = 0
+        processes = [
+            Process(
+                target=_work,
+                args=(
+                    shm.name,
+                    layout,
+                    workers,
+                    w,
+                    range(w, games, workers),
+                    seed,
+                    player_count,
+                    max_turns,
+                    money_bin_width,
+                    edition,
+                ),
+            )
+            for w in range(workers)
+        ]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        totals = {name: array.sum(axis=0) for name, array in arrays.items()}
+        del arrays
+        if failed := [p.exitcode for p in processes if p.exitcode]:
+            raise RuntimeError(f"workers exited with codes {failed}")
+    finally:
+        shm.close()
+        shm.unlink()
+    # Like a `MoneyOverTime` built game by game, only keep the turns the longest game got to
+    longest = max(np.flatnonzero(totals["lengths"]), default=0)
+    money = MoneyOverTime(
+        player_count, money_bin_width, money_bins, counts=totals["money"][:longest]
+    )
+    return Aggregates(
+        totals["landings"],
+        totals["lengths"],
+        money,
+        int(totals["unfinished"][0]),
+    )
@@ -0,0 +1,188 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, Sequence
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from history import History
+
+
+@dataclass
+class Summary:
+    """
+    Mergeable aggregate of game lengths over a batch of games.
+
+    Summaries from separate batches (or separate machines) can be combined with `merge()`
+    without losing anything, as long as the batches were played with the same settings.
+    """
+
+    games: int = 0
+    # Games that reached the max turn count without a winner
+    unfinished: int = 0
+    lengths: Counter = field(default_factory=Counter)
+
+    def add(self, nturns: int, finished: bool = True) -> None:
+        self.games += 1
+        self.unfinished += not finished
+        self.lengths[nturns] += 1
+
+    def merge(self, other: "Summary") -> "Summary":
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.lengths.update(other.lengths)
+        return self
+
+    def mean(self) -> float:
+        return sum(n * count for n, count in self.lengths.items()) / self.games
+
+    def to_dict(self) -> dict:
+        """
+        A JSON-friendly version of the summary.
+        """
+        return {
+            "games": self.games,
+            "unfinished": self.unfinished,
+            "mean": self.mean() if self.games else None,
+            "lengths": {str(n): count for n, count in sorted(self.lengths.items())},
+        }
+
+    def histogram(self) -> np.ndarray:
+        """
+        Game counts indexed by game length.
+        """
+        hist = np.zeros(max(self.lengths, default=0) + 1, np.int64)
+        for n, count in self.lengths.items():
+            hist[n] = count
+        return hist
+
+
+class MoneyOverTime:
+    """
+    Mergeable distribution of each seat's money at each turn, over any number of games.
+
+    Money is counted in fixed-width bins (the last bin also catches everything above it), so
+    memory depends only on the longest game, the number of seats and the number of bins, not on
+    how many games were added. Each turn only counts the games that were still going by then,
+    with the players already eliminated from them counted as having no money.
+    """
+
+    def __init__(
+        self,
+        player_count: int,
+        bin_width: int = 50,
+        bins: int = 200,
+        counts: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Games are added straight into `counts` (indexed by [turn - 1, seat, bin]) if it's given,
+        e.g. to aggregate in shared memory (see `shared`), until one is longer than it.
+        """
+        self._bin_width = bin_width
+        self._counts = (
+            np.zeros((0, player_count, bins), np.int64) if counts is None else counts
+        )
+        assert self._counts.shape[1:] == (player_count, bins), "shape must match"
+
+    @property
+    def bin_width(self) -> int:
+        return self._bin_width
+
+    @property
+    def counts(self) -> np.ndarray:
+        """
+        Player counts indexed by [turn - 1, seat, bin].
+        """
+        return self._counts
+
+    @property
+    def games(self) -> np.ndarray:
+        """
+        Number of games still going at each turn.
+        """
+        return self._counts[:, 0].sum(axis=-1)
+
+    def add(self, history: History) -> None:
+        money = history.dense()
+        _, seats, bins = self._counts.shape
+        self._grow(len(money))
+        bin_index = np.clip(money // self._bin_width, 0, bins - 1)
+        np.add.at(
+            self._counts,
+            (np.arange(len(money))[:, None], np.arange(seats)[None, :], bin_index),
+            1,
+        )
+
+    def merge(self, other: "MoneyOverTime") -> "MoneyOverTime":
+        assert self._bin_width == other._bin_width, "money bins must match"
+        assert self._counts.shape[1:] == other._counts.shape[1:], "shapes must match"
+        self._grow(len(other._counts))
+        self._counts[: len(other._counts)] += other._counts
+        return self
+
+    def quantiles(self, qs: Sequence[float], seat: Optional[int] = None) -> np.ndarray:
+        """
+        Estimated quantiles of money, indexed by [quantile, turn - 1], for the given seat
+        (counting from 0) or for all seats together. Turns without any games are NaN.
+        """
+        counts = (
+            self._counts.sum(axis=1) if seat is None else self._counts[:, seat]
+        ).astype(np.float64)
+        cumulative = counts.cumsum(axis=-1)
+        total = cumulative[:, -1]
+        result = np.full((len(qs), len(counts)), np.nan)
+        for i, q in enumerate(qs):
+            target = q * total
+            # First bin that reaches the target, interpolating linearly within it
+            index = np.minimum(
+                (cumulative < target[:, None]).sum(axis=-1), counts.shape[1] - 1
+            )
+            rows = np.arange(len(counts))
+            before = np.where(index > 0, cumulative[rows, index - 1], 0)
+            in_bin = counts[rows, index]
+            within = np.divide(
+                target - before, in_bin, out=np.zeros_like(target), where=in_bin > 0
+            )
+            result[i] = np.where(total > 0, (index + within) * self._bin_width, np.nan)
+        return result
+
+    def plot(
+        self,
+        seats: Optional[Sequence[int]] = None,
+        percentiles: Sequence[float] = (5, 25, 75, 95),
+    ) -> None:
+        """
+        Fan chart of money over time: the median, with shaded bands between each pair of
+        percentiles around it. Plots all seats together unless `seats` (counting from 0) are given.
+        """
+        percentiles = sorted(percentiles)
+        for seat in [None] if seats is None else seats:
+            median, *bands = self.quantiles(
+                [0.5, *(p / 100 for p in percentiles)], seat
+            )
+            turns = np.arange(1, len(median) + 1)
+            label = "All players" if seat is None else f"Player {seat + 1}"
+            (line,) = plt.plot(turns, median, label=label)
+            for i in range(len(bands) // 2):
+                plt.fill_between(
+                    turns,
+                    bands[i],
+                    bands[-1 - i],
+                    color=line.get_color(),
+                    alpha=0.15,
+                    linewidth=0,
+                )
+        plt.xlabel("Turn Count")
+        plt.ylabel("Money")
+        plt.title(
+            f"Player money over time (median, {', '.join(map(str, percentiles))} percentiles)"
+        )
+        plt.legend()
+        plt.show()
+
+    def _grow(self, turns: int) -> None:
+        if turns > len(self._counts):
+            pad = np.zeros(
+                (turns - len(self._counts), *self._counts.shape[1:]), np.int64
+            )
+            self._counts = np.concatenate([self._counts, pad])
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Event, Process
+from multiprocessing.connection import Client
+import os
+import time
+
+import pytest
+
+import distributed
+from distributed import Chunk, Coordinator, run_chunk, work
+
+GAMES = 400
+CHUNK_SIZE = 20
+SEED = 7
+
+
+def _die(address, authkey, got_chunk) -> None:
+    with Client(address, authkey=authkey) as conn:
+        conn.recv()
+        got_chunk.set()
+        os._exit(1)
+
+
+def _hang(address, authkey, got_chunk) -> None:
+    with Client(address, authkey=authkey) as conn:
+        conn.recv()
+        got_chunk.set()
+        time.sleep(3600)
+
+
+def _send_garbage(address, authkey, got_chunk) -> None:
+    with Client(address, authkey=authkey) as conn:
+        conn.recv()
+        got_chunk.set()
+        conn.send("not a summary")
+        time.sleep(3600)
+
+
+def _slow(address, authkey, got_chunk) -> None:
+    def run_slowly(chunk):
+        got_chunk.set()
+        time.sleep(4)
+        return run_chunk(chunk)
+
+    # Only patched in this (forked) worker process
+    distributed.run_chunk = run_slowly
+    work(address, authkey)
+
+
+def test_chunks_of_lost_workers_are_reassigned():
+    coordinator = Coordinator(GAMES, CHUNK_SIZE, SEED, timeout=2)
+    with ThreadPoolExecutor(1) as executor:
+        result = executor.submit(coordinator.run)
+        # Make sure the failing workers hold a chunk each before any worker can finish
+        failing = []
+        for target in (_die, _die, _hang, _send_garbage, _slow):
+            got_chunk = Event()
+            p = Process(
+                target=target,
+                args=(coordinator.address, coordinator.authkey, got_chunk),
+            )
+            p.start()
+            failing.append(p)
+            assert got_chunk.wait(10)
+        workers = [
+            Process(target=work, args=(coordinator.address, coordinator.authkey))
+            for _ in range(2)
+        ]
+        for p in workers:
+            p.start()
+        try:
+            summary = result.result(timeout=60)
+            # The slow worker finds out that its chunk went to someone else and stops
+            slow = failing.pop()
+            slow.join(10)
+            assert slow.exitcode == 0
+        finally:
+            for p in failing:
+                p.kill()
+                p.join()
+            for p in workers:
+                p.join(10)
+    assert [p.exitcode for p in workers] == [0, 0]
+    assert summary == run_chunk(Chunk(SEED, 0, GAMES, 4, 100))
+
+
+def test_coordinator_requires_authkey_off_loopback():
+    with pytest.raises(ValueError):
+        Coordinator(GAMES, address=("0.0.0.0", 0))
@@ -0,0 +1,92 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import edition
+from edition import DeckKind, EditionError, Kind, Op
+from game import Game
+from seeding import game_seed
+
+STANDARD_JSON = os.path.join(edition.EDITIONS_DIR, "standard.json")
+
+# Game length and final money of games 0-19 of the campaign seeded with 0, as played on the
+# board that was hard-coded in spaces.py before editions were compiled from JSON
+HARD_CODED = [
+    (100, [2493, 1439, 5365, 2993]),
+    (50, [0, 407, 0, 0]),
+    (100, [2365, 3806, 3375, 3069]),
+    (100, [3154, 2873, 4746, 2807]),
+    (53, [0, 0, 115, 0]),
+    (49, [0, 0, 25, 0]),
+    (100, [2801, 3747, 2910, 2487]),
+    (68, [124, 0, 0, 0]),
+    (100, [3458, 2707, 3973, 2580]),
+    (87, [0, 0, 860, 0]),
+    (100, [2661, 3025, 3206, 4398]),
+    (100, [3911, 2768, 2250, 2065]),
+    (31, [0, 1469, 0, 0]),
+    (100, [3592, 3186, 4022, 1982]),
+    (100, [954, 1305, 9336, 765]),
+    (100, [3369, 3598, 2995, 3053]),
+    (100, [139, 0, 484, 0]),
+    (100, [3317, 4521, 2755, 2162]),
+    (100, [2607, 4725, 2900, 3119]),
+    (100, [4230, 3358, 3426, 2629]),
+]
+
+
+def _definition() -> dict:
+    with open(STANDARD_JSON) as f:
+        return json.load(f)
+
+
+def test_compile_and_load_round_trip(tmp_path):
+    definition = _definition()
+    loaded = edition.load(STANDARD_JSON, cache_dir=str(tmp_path))
+    assert os.path.dirname(loaded.path) == str(tmp_path)
+    spaces = definition["spaces"]
+    assert loaded.name == definition["name"]
+    assert loaded.names.tolist() == [s["name"] for s in spaces]
+    assert list(loaded.kinds) == [Kind[s["kind"].upper()] for s in spaces]
+    assert loaded.prices[:, 0].tolist() == [s.get("price", 0) for s in spaces]
+    assert loaded.taxes == tuple(s.get("tax", 0) for s in spaces)
+    for s, rents in zip(spaces, loaded.rents.tolist()):
+        rent = s.get("rent", [])
+        assert rents == rent + [0] * (6 - len(rent))
+    for deck in DeckKind:
+        cards = loaded.cards(deck)
+        assert [text for text, *_ in cards] == [
+            c["text"] for c in definition[deck.name.lower()]
+        ]
+    # Reading the same tables from memory gives the same edition
+    with open(loaded.path, "rb") as f:
+        in_memory = edition.Edition(None, f.read())
+    assert np.array_equal(in_memory.rents, loaded.rents)
+    assert in_memory.cards(DeckKind.CHANCE) == loaded.cards(DeckKind.CHANCE)
+
+
+def test_standard_edition_plays_like_the_hard_coded_board():
+    for i, (turns, money) in enumerate(HARD_CODED):
+        game = Game(4, 100, seed=game_seed(0, i))
+        assert game.run() == turns
+        assert game.history.money[-1].tolist() == money
+
+
+def test_railroad_card_needs_railroads(tmp_path):
+    definition = _definition()
+    for s in definition["spaces"]:
+        if s["kind"] == "railroad":
+            s.update(kind="street", color="Rail", rent=[25] * 6)
+    source = tmp_path / "no-railroads.json"
+    source.write_text(json.dumps(definition))
+    with pytest.raises(EditionError, match="no railroads"):
+        edition.compile_edition(str(source), str(tmp_path / "cache.bin"))
+    definition["chance"] = [
+        c
+        for c in definition["chance"]
+        if Op[c["effect"].upper()] != Op.ADVANCE_TO_RAILROAD
+    ]
+    source.write_text(json.dumps(definition))
+    edition.compile_edition(str(source), str(tmp_path / "cache.bin"))
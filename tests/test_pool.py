@@ -0,0 +1,9 @@
+from pool import simulate_pool
+
+
+def test_threads_and_processes_agree():
+    kwargs = dict(games=200, workers=2, chunk_size=30, seed=3)
+    threads = simulate_pool(threads=True, **kwargs)
+    processes = simulate_pool(threads=False, **kwargs)
+    assert threads.games == 200
+    assert threads == processes
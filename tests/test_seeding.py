@@ -0,0 +1,17 @@
+from collections import Counter
+
+from distributed import Chunk, run_chunk
+import game
+
+SEED = 11
+GAMES = 50
+
+
+def test_simulate_replays_a_game_of_a_chunk():
+    summary = run_chunk(Chunk(SEED, 0, GAMES, 3, 80))
+    replayed = [game.simulate(3, 80, seed=SEED, index=i) for i in range(GAMES)]
+    assert summary.lengths == Counter(replayed)
+    # Game by game, too
+    for i in 0, 17, GAMES - 1:
+        single = run_chunk(Chunk(SEED, i, 1, 3, 80))
+        assert single.lengths == Counter([replayed[i]])